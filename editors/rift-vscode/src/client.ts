@@ -700,6 +700,25 @@ export class MorphLanguageClient
         ? payload.response
         : undefined;
 
+    const responseDelta =
+      payload && {}.hasOwnProperty.call(payload, "response_delta")
+        ? payload.response_delta
+        : undefined;
+
+    if (responseDelta)
+      this.webviewState.update((state) => ({
+        ...state,
+        agents: {
+          ...state.agents,
+          [agent_id]: {
+            ...state.agents[agent_id],
+            streamingText:
+              (state.agents[agent_id].streamingText ?? "") + responseDelta,
+            isStreaming: true,
+          },
+        },
+      }));
+
     if (response)
       this.webviewState.update((state) => ({
         ...state,
@@ -146,6 +146,7 @@ export interface RunAgentProgress {
 export type ChatAgentPayload =
   | {
       response?: string;
+      response_delta?: string;
       done_streaming?: boolean;
     }
   | undefined;
@@ -76,6 +76,17 @@ class AgentTask:
         finally:
             self._running = False
 
+    def reset(self):
+        """
+        Resets the task so that it can be run again
+        """
+        if self._running:
+            raise Exception("Task is already running")
+        self._task = None
+        self._error = None
+        self._cancelled = False
+        self._done = False
+
     def cancel(self):
         """
         Cancels the task
@@ -1,13 +1,31 @@
 import asyncio
+import hashlib
+import json
 import logging
 import os
 import re
+import tempfile
+import threading
+from collections import defaultdict
 from dataclasses import dataclass, field
 from textwrap import dedent
-from typing import Any, ClassVar, Coroutine, Dict, List, Optional, Set, Tuple, cast
+from typing import (
+    Any,
+    AsyncIterator,
+    ClassVar,
+    Coroutine,
+    DefaultDict,
+    Dict,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    cast,
+)
 from urllib.parse import unquote, urlparse
 from urllib.request import url2pathname
 
+import aiohttp
 import openai
 
 import rift.agents.abstract as agent
@@ -25,9 +43,9 @@ from rift.ir.missing_docstrings import (
     files_missing_docstrings_in_project,
 )
 from rift.ir.response import (
+    CodeBlockExtractor,
     Replace,
-    extract_blocks_from_response,
-    replace_functions_from_code_blocks,
+    replace_functions_from_ir_blocks,
     update_typing_imports,
 )
 from rift.lsp import LspServer
@@ -60,123 +78,207 @@ class Config:
     model = "gpt-3.5-turbo"  # ["gpt-3.5-turbo-0613", "gpt-3.5-turbo-16k"]
     temperature = 0.0
     max_size_group_missing_docstrings = 10  # Max number of functions to process at once
+    max_concurrent_requests = 5  # Max number of LLM requests in flight at once
+    cache_responses = True  # Cache the responses to temperature 0 requests on disk
+    max_cached_responses = 1000  # Max number of responses kept in the cache
+
+
+_URI_RE = re.compile(r"\[uri\]\((\S+)\)")
+
+_EXAMPLE_PY = '''
+    For python:
+    ```python
+        def foo(a: t1, b : t2) -> t3
+            """
+            Adds two numbers together.
+
+            :param a: The first number to add.
+            :param b: The second number to add.
+            :return: The sum of a and b.
+            """
+    ```
+'''
+_EXAMPLE_JS = """
+    For javascript:
+    ```javascript
+        /**
+        * Adds two numbers together.
+        * 
+        * @param {t1} a - The first number to add.
+        * @param {t2} b - The second number to add.
+        * @returns {t3} The sum of a and b.
+        */
+        function foo(a: t1, b : t2) : t3 {
+    ```
+"""
+_EXAMPLE_TS = """
+    For typescript and tsx:
+    ```typescript
+        /**
+        * Adds two numbers together.
+        * 
+        * @param a - The first number to add.
+        * @param b - The second number to add.
+        * @returns The sum of a and b.
+        */
+        function foo(a: t1, b : t2): t3 {
+    ```
+"""
+_EXAMPLE_OCAML = """
+    For ocaml:
+    ```ocaml
+        (** Adds two numbers together.
+        @param a The first number to add.
+        @param b The second number to add.
+        @return The sum of a and b. *)
+        let foo (a: t1) (b : t2) : t3 =
+    ```
+"""
+
+# The system message is identical for every request, regardless of the language, so that
+# the prompt prefix can be served from the OpenAI prompt cache across files and groups.
+_SYSTEM_MSG_CACHED = dedent(
+    """
+    Act as an expert software developer.
+    For each function to modify, give an *edit block* per the examples below.
+    The language of the code is given in the first line of the request.
+
+    You MUST format EVERY code change with an *edit block* like this:
+    """
+    + _EXAMPLE_PY
+    + _EXAMPLE_JS
+    + _EXAMPLE_TS
+    + _EXAMPLE_OCAML
+    + """
+    Every *edit block* must be fenced with ```...``` with the correct code language.
+    Edits to different functions each need their own *edit block*.
+    Give all the required changes at once in the reply.
+    """
+).lstrip()
+
+_USER_MSG_TPL = dedent(
+    """
+    Language: {language}
+    Write doc strings for the following functions:
+    {missing}
+
+    The code is:
+    ```
+    {code}
+    ```
+    """
+).lstrip()
+
+
+def prompt_cache_key(path: str) -> str:
+    """Stable per-file key, so that repeated requests on the same file hit the same cache shard."""
+    return hashlib.sha256(path.encode("utf-8")).hexdigest()[:32]
+
+
+class ResponseCache:
+    """
+    Disk cache of the responses to deterministic (temperature 0) requests, so that sending
+    the same prompt again, e.g. when re-running the agent on a file, does not call the LLM.
+    """
+
+    version = 1  # bump to invalidate the cache when the prompts change
+    dir = os.path.join(os.path.expanduser("~"), ".rift", "docstring_cache")
+
+    @staticmethod
+    def key(prompt: Prompt) -> Optional[str]:
+        if not Config.cache_responses or Config.temperature != 0:
+            return None
+        data = dict(v=ResponseCache.version, m=Config.model, t=Config.temperature, msgs=prompt)
+        return hashlib.sha256(json.dumps(data, sort_keys=True).encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def get(key: str) -> Optional[str]:
+        try:
+            with open(os.path.join(ResponseCache.dir, key), "r", encoding="utf-8") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    @staticmethod
+    def set(key: str, response: str) -> None:
+        try:
+            os.makedirs(ResponseCache.dir, exist_ok=True)
+            # write to a temporary file and rename it, so that readers never see a partial entry
+            fd, tmp_path = tempfile.mkstemp(dir=ResponseCache.dir, prefix=".", suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    f.write(response)
+                os.replace(tmp_path, os.path.join(ResponseCache.dir, key))
+            except BaseException:
+                try:
+                    os.unlink(tmp_path)
+                except OSError:
+                    pass
+                raise
+            ResponseCache.prune()
+        except OSError as e:
+            logger.warning(f"Failed to write to the response cache: {e}")
+
+    @staticmethod
+    def prune() -> None:
+        """Remove the least recently written entries beyond Config.max_cached_responses."""
+        entries = []
+        with os.scandir(ResponseCache.dir) as it:
+            for entry in it:
+                if entry.name.startswith("."):
+                    continue  # temporary file being written
+                try:
+                    entries.append((entry.stat().st_mtime, entry.path))
+                except OSError:
+                    pass  # removed meanwhile
+        if len(entries) <= Config.max_cached_responses:
+            return
+        entries.sort()
+        for _, path in entries[: len(entries) - Config.max_cached_responses]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass  # removed meanwhile
 
 
 class MissingDocStringPrompt:
     @staticmethod
     def mk_user_msg(
-        functions_missing_docstrings: List[FunctionMissingDocstring], code: IR.Code
+        language: IR.Language,
+        functions_missing_docstrings: List[FunctionMissingDocstring],
+        code: IR.Code,
     ) -> str:
-        missing_str = ""
-        n = 0
-        for function in functions_missing_docstrings:
-            n += 1
-            missing_str += f"{n}. {function.function_declaration.name}\n"
-
-        return dedent(
-            f"""
-        Write doc strings for the following functions:
-        {missing_str}
-
-        The code is:
-        ```
-        {code}
-        ```
-        """
-        ).lstrip()
+        missing_str = "".join(
+            f"{n}. {function.function_declaration.name}\n"
+            for n, function in enumerate(functions_missing_docstrings, 1)
+        )
+        return _USER_MSG_TPL.format(language=language, missing=missing_str, code=code)
 
     @staticmethod
     def code_for_missing_docstring_functions(
         functions_missing_docstrings: List[FunctionMissingDocstring],
     ) -> IR.Code:
-        bytes = b""
-        for function in functions_missing_docstrings:
-            bytes += function.function_declaration.get_substring()
-            bytes += b"\n"
-        return IR.Code(bytes)
+        parts = [
+            function.function_declaration.get_substring()
+            for function in functions_missing_docstrings
+        ]
+        buf = b"\n".join(parts) + b"\n" if parts else b""
+        return IR.Code(buf)
 
     @staticmethod
     def create_prompt_for_file(
         language: IR.Language,
         functions_missing_docstrings: List[FunctionMissingDocstring],
     ) -> Prompt:
-        example_py = '''
-            ```python
-                def foo(a: t1, b : t2) -> t3
-                    """
-                    Adds two numbers together.
-
-                    :param a: The first number to add.
-                    :param b: The second number to add.
-                    :return: The sum of a and b.
-                    """
-            ```
-        '''
-        example_js = """
-            ```javascript
-                /**
-                * Adds two numbers together.
-                * 
-                * @param {t1} a - The first number to add.
-                * @param {t2} b - The second number to add.
-                * @returns {t3} The sum of a and b.
-                */
-                function foo(a: t1, b : t2) : t3 {
-            ```
-        """
-        example_ts = """
-            ```typescript
-                /**
-                * Adds two numbers together.
-                * 
-                * @param a - The first number to add.
-                * @param b - The second number to add.
-                * @returns The sum of a and b.
-                */
-                function foo(a: t1, b : t2): t3 {
-            ```
-        """
-        example_ocaml = """
-            ```ocaml
-                (** Adds two numbers together.
-                @param a The first number to add.
-                @param b The second number to add.
-                @return The sum of a and b. *)
-                let foo (a: t1) (b : t2) : t3 =
-            ```
-        """
-        example = ""
-        if language in ["typescript", "tsx"]:
-            example = example_ts
-        elif language == "javascript":
-            example = example_js
-        elif language == "ocaml":
-            example = example_ocaml
-        else:
-            example = example_py
-        system_msg = dedent(
-            """
-            Act as an expert software developer.
-            For each function to modify, give an *edit block* per the example below.
-
-            You MUST format EVERY code change with an *edit block* like this:
-            """
-            + example
-            + """
-            Every *edit block* must be fenced with ```...``` with the correct code language.
-            Edits to different functions each need their own *edit block*.
-            Give all the required changes at once in the reply.
-            """
-        ).lstrip()
-
         code = MissingDocStringPrompt.code_for_missing_docstring_functions(
             functions_missing_docstrings
         )
         return [
-            dict(role="system", content=system_msg),
+            dict(role="system", content=_SYSTEM_MSG_CACHED),
             dict(
                 role="user",
                 content=MissingDocStringPrompt.mk_user_msg(
+                    language=language,
                     functions_missing_docstrings=functions_missing_docstrings,
                     code=code,
                 ),
@@ -187,12 +289,37 @@ class MissingDocStringPrompt:
 @dataclass
 class FileProcess:
     file_missing_docstrings: FileMissingDocstrings
+    groups: List[List[FunctionMissingDocstring]] = field(default_factory=list)
     edits: List[IR.CodeEdit] = field(default_factory=list)
     updated_functions: List[IR.Symbol] = field(default_factory=list)
     file_change: Optional[file_diff.FileChange] = None
     new_num_missing: Optional[int] = None
 
 
+# number of missing doc strings, keyed by (digest of the code, language)
+_num_missing_cache: Dict[Tuple[bytes, IR.Language], int] = {}
+# get_num_missing_in_code runs in asyncio.to_thread workers
+_num_missing_cache_lock = threading.Lock()
+NUM_MISSING_CACHE_MAX_SIZE = 64
+
+
+def get_num_missing_in_code(code: IR.Code, language: IR.Language) -> int:
+    key = (hashlib.blake2b(code.bytes, digest_size=16).digest(), language)
+    with _num_missing_cache_lock:
+        num_missing = _num_missing_cache.get(key)
+    if num_missing is None:
+        file = IR.File("dummy")
+        parser.parse_code_block(file, code, language)
+        num_missing = len(functions_missing_docstrings_in_file(file))
+        with _num_missing_cache_lock:
+            if key not in _num_missing_cache:
+                if len(_num_missing_cache) >= NUM_MISSING_CACHE_MAX_SIZE:
+                    # evict the oldest entry
+                    _num_missing_cache.pop(next(iter(_num_missing_cache)), None)
+                _num_missing_cache[key] = num_missing
+    return num_missing
+
+
 @registry.agent(
     agent_description="Generate missing docstrings for functions",
     display_name="Auto Doc",
@@ -206,6 +333,11 @@ class MissingDocstringAgent(agent.ThirdPartyAgent):
     agent_type: ClassVar[str] = "missing_docstring_agent"
     params_cls: ClassVar[Any] = Params
     debug: bool = Config.debug
+    # caps this agent's LLM requests in flight; created with the agent, so it belongs to the
+    # event loop the agent runs on
+    llm_semaphore: asyncio.Semaphore = field(
+        default_factory=lambda: asyncio.Semaphore(Config.max_concurrent_requests)
+    )
 
     @classmethod
     async def create(cls, params: Any, server: LspServer) -> Any:
@@ -219,19 +351,16 @@ class MissingDocstringAgent(agent.ThirdPartyAgent):
         language: IR.Language,
         functions_missing_docstrings: List[FunctionMissingDocstring],
         response: str,
+        ir_blocks: IR.File,
     ) -> Tuple[List[IR.CodeEdit], List[IR.Symbol]]:
         if self.debug:
             logger.info(f"response: {response}")
-        code_blocks = extract_blocks_from_response(response)
-        logger.info(f"{code_blocks=}")
-        if self.debug:
-            logger.info(f"code_blocks: \n{code_blocks}\n")
-        filter_function_ids = [
+        filter_function_ids = frozenset(
             function.function_declaration.get_qualified_id()
             for function in functions_missing_docstrings
-        ]
-        x = replace_functions_from_code_blocks(
-            code_blocks=code_blocks,
+        )
+        x = replace_functions_from_ir_blocks(
+            ir_blocks=ir_blocks,
             document=document,
             language=language,
             filter_function_ids=filter_function_ids,
@@ -245,6 +374,7 @@ class MissingDocstringAgent(agent.ThirdPartyAgent):
         document: IR.Code,
         language: IR.Language,
         functions_missing_docstrings: List[FunctionMissingDocstring],
+        cache_key: Optional[str] = None,
     ) -> Tuple[List[IR.CodeEdit], List[IR.Symbol]]:
         prompt = MissingDocStringPrompt.create_prompt_for_file(
             language=language,
@@ -252,40 +382,72 @@ class MissingDocstringAgent(agent.ThirdPartyAgent):
         )
         response_stream = TextStream()
         collected_messages: List[str] = []
+        response_key = ResponseCache.key(prompt)
+        cached_response = (
+            await asyncio.to_thread(ResponseCache.get, response_key) if response_key else None
+        )
+        # code blocks are extracted as soon as they are complete, while the response streams,
+        # and parsed once the stream is done, so that parse errors cannot stall the feeder
+        extractor = CodeBlockExtractor()
+        code_blocks: List[IR.Code] = []
+        finish_reason: Optional[str] = None
 
         async def feed_task():
-            openai.api_key = os.environ.get("OPENAI_API_KEY")
-            completion: List[Dict[str, Any]] = openai.ChatCompletion.create(  # type: ignore
-                model=Config.model,
-                messages=prompt,
-                temperature=Config.temperature,
-                stream=True,
-            )
-            for chunk in completion:
-                await asyncio.sleep(0.0001)
-                chunk_message_dict = chunk["choices"][0]  # type: ignore
-                chunk_message: str = chunk_message_dict["delta"].get(
-                    "content"
-                )  # extract the message
-                if chunk_message_dict["finish_reason"] is None and chunk_message:
-                    collected_messages.append(chunk_message)  # save the message
-                    response_stream.feed_data(chunk_message)
+            nonlocal finish_reason
+            try:
+                # only the request itself counts against the limit, not the chat updates
+                async with self.llm_semaphore:
+                    completion: AsyncIterator[Dict[str, Any]] = await openai.ChatCompletion.acreate(  # type: ignore
+                        model=Config.model,
+                        messages=prompt,
+                        temperature=Config.temperature,
+                        stream=True,
+                        user=cache_key or "",
+                    )
+                    async for chunk in completion:
+                        chunk_message_dict = chunk["choices"][0]  # type: ignore
+                        chunk_message: str = chunk_message_dict["delta"].get(
+                            "content"
+                        )  # extract the message
+                        if chunk_message_dict["finish_reason"] is None and chunk_message:
+                            collected_messages.append(chunk_message)  # save the message
+                            response_stream.feed_data(chunk_message)
+                            code_blocks.extend(extractor.feed(chunk_message))
+                        elif chunk_message_dict["finish_reason"] is not None:
+                            finish_reason = chunk_message_dict["finish_reason"]
+            finally:
+                # always end the stream, or send_chat_update would wait on it forever
+                response_stream.feed_eof()
+
+        if cached_response is not None:
+            collected_messages.append(cached_response)
+            response_stream.feed_data(cached_response)
             response_stream.feed_eof()
-
-        response_stream._feed_task = asyncio.create_task(  # type: ignore
-            self.add_task(  # type: ignore
-                f"Write doc strings for {'/'.join(function.function_declaration.name for function in functions_missing_docstrings)}",
-                feed_task,
-            ).run()
-        )
+            code_blocks.extend(extractor.feed(cached_response))
+        else:
+            response_stream._feed_task = asyncio.create_task(  # type: ignore
+                self.add_task(  # type: ignore
+                    f"Write doc strings for {'/'.join(function.function_declaration.name for function in functions_missing_docstrings)}",
+                    feed_task,
+                ).run()
+            )
 
         await self.send_chat_update(response_stream)
+        code_blocks.extend(extractor.feed_eof())
+        ir_blocks = IR.File("response")
+        for block in code_blocks:
+            logger.info(f"{block=}")
+            parser.parse_code_block(ir_blocks, block, language)
         response = "".join(collected_messages)
+        # cache only complete responses: not truncated ("length"), failed, or without code
+        if response_key and cached_response is None and finish_reason == "stop" and code_blocks:
+            await asyncio.to_thread(ResponseCache.set, response_key, response)
         return self.process_response(
             document=document,
             language=language,
             functions_missing_docstrings=functions_missing_docstrings,
             response=response,
+            ir_blocks=ir_blocks,
         )
 
     def split_missing_docstrings_in_groups(
@@ -294,37 +456,30 @@ class MissingDocstringAgent(agent.ThirdPartyAgent):
         """Split the missing doc strings in groups of at most Config.max_size_group_missing_docstrings, and that don't contain functions with the same name."""
         groups: List[List[FunctionMissingDocstring]] = []
         group: List[FunctionMissingDocstring] = []
+        seen: Set[str] = set()  # names of the functions in the current group
         for function in functions_missing_docstrings:
-            group.append(function)
-            split = len(group) == Config.max_size_group_missing_docstrings
+            name = function.function_declaration.name
             # also split if a function with the same name is in the current group (e.g. from another class)
-            for function2 in group:
-                if function.function_declaration.name == function2.function_declaration.name:
-                    split = True
-                    break
+            split = len(group) >= Config.max_size_group_missing_docstrings or name in seen
             if split:
                 groups.append(group)
                 group = []
+                seen = set()
+            group.append(function)
+            seen.add(name)
         if len(group) > 0:
             groups.append(group)
         return groups
 
     async def process_file(self, file_process: FileProcess, project: IR.Project) -> None:
+        """Apply the edits collected from the responses for all the groups of a file."""
         file_missing_docstrings = file_process.file_missing_docstrings
         language = file_missing_docstrings.language
         document = file_missing_docstrings.ir_code
-        groups_of_functions_missing_docstrings = self.split_missing_docstrings_in_groups(
-            file_missing_docstrings.functions_missing_docstrings
-        )
-
-        for group in groups_of_functions_missing_docstrings:
-            code_edits, updated_functions = await self.code_edits_for_missing_files(
-                document=document,
-                language=language,
-                functions_missing_docstrings=group,
-            )
-            file_process.edits.extend(code_edits)
-            file_process.updated_functions.extend(updated_functions)
+        if file_process.edits == [] and file_process.updated_functions == []:
+            return  # nothing to apply: skip parsing and diffing the file
+        # with Replace.DOC, each code edit inserts exactly one doc string
+        num_docstrings_added = len(file_process.edits)
         edit_import = update_typing_imports(
             code=document,
             language=language,
@@ -335,18 +490,23 @@ class MissingDocstringAgent(agent.ThirdPartyAgent):
 
         old_num_missing = len(file_missing_docstrings.functions_missing_docstrings)
         logger.info(f"ABOUT TO APPLY EDITS: {file_process.edits}")
-        new_document = document.apply_edits(file_process.edits)
+        new_document = await asyncio.to_thread(document.apply_edits, file_process.edits)
         logger.info(f"{new_document=}")
-        dummy_file = IR.File("dummy")
-        parser.parse_code_block(dummy_file, new_document, language)
-        new_num_missing = len(functions_missing_docstrings_in_file(dummy_file))
+        new_num_missing = old_num_missing - num_docstrings_added
+        if self.debug:
+            num_missing_parsed = await asyncio.to_thread(
+                get_num_missing_in_code, new_document, language
+            )
+            logger.info(f"missing doc strings after parsing: {num_missing_parsed}")
         await self.send_chat_update(
             f"Received docs for `{file_missing_docstrings.ir_name.path}` ({new_num_missing}/{old_num_missing} missing)"
         )
         if self.debug:
             logger.info(f"new_document:\n{new_document}\n")
         path = os.path.join(project.root_path, file_missing_docstrings.ir_name.path)
-        file_change = file_diff.get_file_change(path=path, new_content=str(new_document))
+        file_change = await asyncio.to_thread(
+            file_diff.get_file_change, path=path, new_content=str(new_document)
+        )
         if self.debug:
             logger.info(f"file_change:\n{file_change}\n")
         file_process.file_change = file_change
@@ -421,18 +581,17 @@ class MissingDocstringAgent(agent.ThirdPartyAgent):
             user_uris = []
         else:
             self.get_state().messages.append(openai_types.Message.user(user_response))
-            user_uris = re.findall(r"\[uri\]\((\S+)\)", user_response)
+            user_uris = _URI_RE.findall(user_response)
         if user_uris == []:
             user_uris = [current_file_uri]
         user_references = [IR.Reference.from_uri(uri) for uri in user_uris]
-        symbols_per_file: Dict[str, Set[IR.QualifiedId]] = {}
+        symbols_per_file: DefaultDict[str, Set[IR.QualifiedId]] = defaultdict(set)
         for ref in user_references:
             if ref.qualified_id:
-                if ref.file_path not in symbols_per_file:
-                    symbols_per_file[ref.file_path] = set()
                 symbols_per_file[ref.file_path].add(ref.qualified_id)
-        user_paths = [ref.file_path for ref in user_references]
-        project = parser.parse_files_in_paths(paths=user_paths)
+        # remove duplicate paths, keeping the order, so that each file is parsed once
+        user_paths = list(dict.fromkeys(ref.file_path for ref in user_references))
+        project = await parser.parse_files_in_paths_async(paths=user_paths)
         if self.debug:
             logger.info(f"\n=== Project Map ===\n{project.dump_map()}\n")
 
@@ -441,7 +600,8 @@ class MissingDocstringAgent(agent.ThirdPartyAgent):
         for file_missing_docstrings in files_missing_docstrings_:
             full_path = os.path.join(project.root_path, file_missing_docstrings.ir_name.path)
             if full_path not in symbols_per_file:  # no symbols in this file
-                files_missing_docstrings.append(file_missing_docstrings)
+                if file_missing_docstrings.functions_missing_docstrings != []:
+                    files_missing_docstrings.append(file_missing_docstrings)
             else:  # filter missing doc strings to only include symbols in symbols_per_file
                 functions_missing_docstrings = [
                     function_missing_docstrings
@@ -471,6 +631,38 @@ class MissingDocstringAgent(agent.ThirdPartyAgent):
             f"Missing {total_num_missing} doc strings in {files_missing_str}"
         )
 
+        # all the groups of all the files share the same bound on concurrent requests
+        for file_process in file_processes:
+            file_process.groups = self.split_missing_docstrings_in_groups(
+                file_process.file_missing_docstrings.functions_missing_docstrings
+            )
+        jobs = [
+            (file_process, group)
+            for file_process in file_processes
+            for group in file_process.groups
+        ]
+        # share one HTTP session, and its connection pool, across all the requests
+        async with aiohttp.ClientSession() as session:
+            token = openai.aiosession.set(session)
+            try:
+                results = await asyncio.gather(
+                    *[
+                        self.code_edits_for_missing_files(
+                            document=file_process.file_missing_docstrings.ir_code,
+                            language=file_process.file_missing_docstrings.language,
+                            functions_missing_docstrings=group,
+                            cache_key=prompt_cache_key(
+                                file_process.file_missing_docstrings.ir_name.path
+                            ),
+                        )
+                        for file_process, group in jobs
+                    ]
+                )
+            finally:
+                openai.aiosession.reset(token)
+        for (file_process, _group), (code_edits, updated_functions) in zip(jobs, results):
+            file_process.edits.extend(code_edits)
+            file_process.updated_functions.extend(updated_functions)
         tasks: List[asyncio.Task[Any]] = [
             asyncio.create_task(self.process_file(file_process=file_processes[i], project=project))
             for i in range(len(files_missing_docstrings))
@@ -1,11 +1,11 @@
 import asyncio
+import inspect
 import logging
 import os
 import re
-import time
-from concurrent import futures
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
-from typing import ClassVar, List, Optional, Type
+from typing import Callable, ClassVar, List, Optional, Type
 
 logger = logging.getLogger(__name__)
 
@@ -21,9 +21,23 @@ import rift.agents.abstract as agent
 import rift.ir.IR as IR
 import rift.llm.openai_types as openai
 import rift.lsp.types as lsp
+import rift.util.asyncgen as asyncgen
 import rift.util.file_diff as file_diff
 from rift.util.TextStream import TextStream
 
+_URI_RE = re.compile(r"\[uri\]\((\S+)\)")
+_SCHEME_LEN = {"file://": 7, "uri://": 6}
+
+RESPONSE_STREAM_MAX_BUFFER_SIZE = 64 * 1024
+
+
+def _colored(*args, **kwargs):
+    return args[0]
+
+
+def _highlight(*args, **kwargs):
+    return args[0]
+
 
 @dataclass
 class MentatAgentParams(agent.AgentParams):
@@ -34,8 +48,16 @@ class MentatAgentParams(agent.AgentParams):
 class MentatAgentState(agent.AgentState):
     params: MentatAgentParams
     messages: list[openai.Message]
-    response_lock: asyncio.Lock = field(default_factory=asyncio.Lock)
-    _response_buffer: str = ""
+    response_cond: asyncio.Condition = field(default_factory=asyncio.Condition)
+    _response_buffer: List[str] = field(default_factory=list)
+    # separators fed into the response stream, and segments the chat thread has finished
+    _separators_fed: int = 0
+    _segments_done: int = 0
+    _chat_thread_exited: bool = False
+
+    @property
+    def response_text(self) -> str:
+        return "".join(self._response_buffer)
 
 
 @dataclass
@@ -58,6 +80,29 @@ class Mentat(agent.ThirdPartyAgent):
     agent_type: ClassVar[str] = "mentat"
     run_params: Type[MentatAgentParams] = MentatAgentParams
     state: Optional[MentatAgentState] = None
+    _mentat_patched: ClassVar[bool] = False
+    _send_chat_update: ClassVar[Optional[Callable[..., None]]] = None
+
+    @classmethod
+    def _patch_mentat(cls, send_chat_update: Callable[..., None]):
+        """
+        Route mentat's terminal output to `send_chat_update`.
+        The module attributes are patched once per process; later runs only swap the target.
+        """
+        cls._send_chat_update = send_chat_update
+        if cls._mentat_patched:
+            return
+
+        def print_wrapper(*args, **kwargs):
+            return cls._send_chat_update(*args, **kwargs)
+
+        for n, m in inspect.getmembers(mentat, inspect.ismodule):
+            setattr(m, "cprint", print_wrapper)
+            setattr(m, "print", print_wrapper)
+            setattr(m, "colored", _colored)
+            setattr(m, "highlight", _highlight)
+            setattr(m, "change_delimiter", "```")
+        cls._mentat_patched = True
 
     @classmethod
     async def create(cls, params: MentatAgentParams, server):
@@ -90,22 +135,31 @@ class Mentat(agent.ThirdPartyAgent):
         )
 
     async def _run_chat_thread(self, response_stream):
-        before, after = response_stream.split_once("感")
-        try:
-            async with self.state.response_lock:
-                async for delta in before:
-                    self.state._response_buffer += delta
-                    await self.send_progress({"response": self.state._response_buffer})
-            await asyncio.sleep(0.1)
-            await self._run_chat_thread(after)
-        except Exception as e:
-            logger.info(f"[_run_chat_thread] caught exception={e}, exiting")
+        source = response_stream  # the stream fed from mentat's thread
+        while not response_stream.at_eof():
+            before, after = response_stream.split_once("感")
+            cond = self.state.response_cond
+            try:
+                async for delta in asyncgen.coalesce(before):
+                    self.state._response_buffer.append(delta)
+                    await self.send_progress({"response_delta": delta})
+                response_stream = after
+            except Exception as e:
+                logger.info(f"[_run_chat_thread] caught exception={e}, exiting")
+                self.state._chat_thread_exited = True
+                # nothing reads the stream any more: wake feeders waiting for it to drain
+                source.feed_eof()
+                return
+            finally:
+                async with cond:
+                    self.state._segments_done += 1
+                    cond.notify_all()
 
     async def run(self) -> MentatRunResult:
         """
         This is the main method of the Mentat agent. It starts the chat thread and handles the main loop of the agent.
         """
-        response_stream = TextStream()
+        response_stream = TextStream(max_buffer_size=RESPONSE_STREAM_MAX_BUFFER_SIZE)
 
         run_chat_thread_task = asyncio.create_task(self._run_chat_thread(response_stream))
 
@@ -113,22 +167,38 @@ class Mentat(agent.ThirdPartyAgent):
 
         def send_chat_update_wrapper(prompt: str = "感", *args, end="\n", **kwargs):
             async def _worker():
-                response_stream.feed_data(prompt + end)
+                if self.state._chat_thread_exited:
+                    return  # nobody reads the stream any more: drop the text
+                text = prompt + end
+                try:
+                    await response_stream.feed_data_async(text)
+                except RuntimeError:
+                    # the chat thread exited, and ended the stream, while we were waiting
+                    if self.state._chat_thread_exited:
+                        return
+                    raise
+                self.state._separators_fed += text.count("感")
 
-            asyncio.run_coroutine_threadsafe(_worker(), loop=loop)
+            # blocks mentat's thread while the response stream is over its high-water mark
+            asyncio.run_coroutine_threadsafe(_worker(), loop=loop).result()
 
         def request_chat_wrapper(prompt: Optional[str] = None, *args, **kwargs):
             async def request_chat():
-                response_stream.feed_data("感")
-                await asyncio.sleep(0.1)
-                await self.state.response_lock.acquire()
-                await self.send_progress(
-                    dict(response=self.state._response_buffer, done_streaming=True)
-                )
-                self.state.messages.append(
-                    openai.Message.assistant(content=self.state._response_buffer)
-                )
-                self.state._response_buffer = ""
+                if not self.state._chat_thread_exited:
+                    response_stream.feed_data("感")
+                    self.state._separators_fed += 1
+                segment = self.state._separators_fed
+                cond = self.state.response_cond
+                async with cond:
+                    # wait for the chat thread to reach the separator fed above
+                    await cond.wait_for(
+                        lambda: self.state._segments_done >= segment
+                        or self.state._chat_thread_exited
+                    )
+                    response_text = self.state.response_text
+                    self.state._response_buffer.clear()
+                await self.send_progress(dict(response=response_text, done_streaming=True))
+                self.state.messages.append(openai.Message.assistant(content=response_text))
                 if prompt is not None:
                     self.state.messages.append(openai.Message.assistant(content=prompt))
 
@@ -139,25 +209,24 @@ class Mentat(agent.ThirdPartyAgent):
                 dropped_symbols = False
 
                 def refactor_uri_match(resp: str):
-                    uri_pattern = r"\[uri\]\((\S+)\)"
+                    workspace_folder_path = self.state.params.workspaceFolderPath
+                    relpath_cache: dict[str, str] = {}
 
                     def replacement(m: re.Match[str]):
-                        parsed_uri = m.group(1)
-                        if "#" in uri:
+                        uri, sep, symbol = m.group(1).partition("#")
+                        if sep:
                             nonlocal dropped_symbols
                             dropped_symbols = True
-                            uri, symbol = parsed_uri.split("#")[0], parsed_uri.split("#")[1]
-                        else:
-                            uri = parsed_uri
 
                         reference = IR.Reference.from_uri(uri)
                         file_path = reference.file_path
-                        relative_path = os.path.relpath(
-                            file_path, self.state.params.workspaceFolderPath
-                        )
-                        return f"`{relative_path}`" if not dropped_symbols else f"{symbol} @ `{relative_path}`"
+                        relative_path = relpath_cache.get(file_path)
+                        if relative_path is None:
+                            relative_path = os.path.relpath(file_path, workspace_folder_path)
+                            relpath_cache[file_path] = relative_path
+                        return f"{symbol} @ `{relative_path}`" if sep else f"`{relative_path}`"
 
-                    resp = re.sub(uri_pattern, replacement, resp)
+                    resp = _URI_RE.sub(replacement, resp)
                     return resp
 
                 try:
@@ -171,15 +240,9 @@ class Mentat(agent.ThirdPartyAgent):
                 except:
                     pass
                 self.state.messages.append(openai.Message.user(content=resp))
-                self.state.response_lock.release()
                 return resp
 
-            t = asyncio.run_coroutine_threadsafe(request_chat(), loop)
-            futures.wait([t])
-            result = t.result()
-            return result
-
-        import inspect
+            return asyncio.run_coroutine_threadsafe(request_chat(), loop).result()
 
         def collect_user_input(self) -> str:
             user_input = request_chat_wrapper().strip()
@@ -187,12 +250,6 @@ class Mentat(agent.ThirdPartyAgent):
                 raise mentat.user_input_manager.UserQuitInterrupt()
             return user_input
 
-        def colored(*args, **kwargs):
-            return args[0]
-
-        def highlight(*args, **kwargs):
-            return args[0]
-
         file_changes = []
 
         from collections import defaultdict
@@ -202,11 +259,9 @@ class Mentat(agent.ThirdPartyAgent):
         event = asyncio.Event()
         event2 = asyncio.Event()
 
-        async def set_event():
-            event.set()
-
         def write_changes_to_files(self, code_changes: list[CodeChange]) -> None:
-            files_to_write = dict()
+            # rel_path -> lines of a created file (None if only edited), in first-seen order
+            files_to_write: dict[str, Optional[list[str]]] = dict()
             file_changes_dict = defaultdict(list)
             for code_change in code_changes:
                 rel_path = code_change.file
@@ -216,34 +271,29 @@ class Mentat(agent.ThirdPartyAgent):
                 elif code_change.action == CodeChangeAction.DeleteFile:
                     self._handle_delete(code_change)
                 else:
-                    changes = file_changes_dict[rel_path]
-                    logging.getLogger().info(f"{changes=}")
-                    changes.append(code_change)
-
-            for file_path, changes in file_changes_dict.items():
-                new_code_lines = self._get_new_code_lines(changes)
-                if new_code_lines:
-                    files_to_write[file_path] = new_code_lines
+                    files_to_write.setdefault(rel_path, None)
+                    file_changes_dict[rel_path].append(code_change)
+            logger.debug(
+                "code changes per file: %s", {k: len(v) for k, v in file_changes_dict.items()}
+            )
 
             for rel_path, code_lines in files_to_write.items():
+                changes = file_changes_dict.get(rel_path)
+                if changes:
+                    # edits are resolved once per file, after all changes are grouped
+                    code_lines = self._get_new_code_lines(changes) or code_lines
+                if code_lines is None:
+                    continue
                 file_path = os.path.join(self.git_root, rel_path)
                 if file_path not in self.file_paths:
-                    logging.info(f"Adding new file {file_path} to context")
+                    logger.info(f"Adding new file {file_path} to context")
                     self.file_paths.append(file_path)
                 file_changes.append(file_diff.get_file_change(file_path, "\n".join(code_lines)))
-            asyncio.run_coroutine_threadsafe(set_event(), loop=loop)
-            while True:
-                if not event2.is_set():
-                    time.sleep(0.25)
-                    continue
-                break
+            loop.call_soon_threadsafe(event.set)
+            # block this worker thread until the main loop has applied the changes
+            asyncio.run_coroutine_threadsafe(event2.wait(), loop).result()
 
-        for n, m in inspect.getmembers(mentat, inspect.ismodule):
-            setattr(m, "cprint", send_chat_update_wrapper)
-            setattr(m, "print", send_chat_update_wrapper)
-            setattr(m, "colored", colored)
-            setattr(m, "highlight", highlight)
-            setattr(m, "change_delimiter", "```")
+        Mentat._patch_mentat(send_chat_update_wrapper)
 
         mentat.user_input_manager.UserInputManager.collect_user_input = collect_user_input
         mentat.code_file_manager.CodeFileManager.write_changes_to_files = write_changes_to_files
@@ -252,14 +302,14 @@ class Mentat(agent.ThirdPartyAgent):
         dropped_symbols = False
 
         def extract_path(uri: str):
-            if "#" in uri:
+            head, sep, _ = uri.partition("#")
+            if sep:
                 nonlocal dropped_symbols
                 dropped_symbols = True
-                uri = uri.split("#")[0]
-            if uri.startswith("file://"):
-                return uri[7:]
-            if uri.startswith("uri://"):
-                return uri[6:]
+            for scheme, n in _SCHEME_LEN.items():
+                if head.startswith(scheme):
+                    return head[n:]
+            return None
 
         # TODO: revisit auto-context population at some point
         # paths = (
@@ -312,17 +362,20 @@ class Mentat(agent.ThirdPartyAgent):
         async def mentat_loop():
             nonlocal file_changes
 
-            fut = loop.run_in_executor(None, mentat.app.run, mentat.app.expand_paths(paths))
+            # mentat blocks on chat round-trips, so keep it off the loop's default executor
+            executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="mentat")
+            fut = loop.run_in_executor(executor, mentat.app.run, mentat.app.expand_paths(paths))
             fut.add_done_callback(done_cb)
             while True:
                 await event.wait()
+                event.clear()
                 if finished:
                     break
+                event2.clear()
                 if len(file_changes) > 0:
                     await self.apply_file_changes(file_changes)
                     file_changes = []
                 event2.set()
-                event.clear()
             try:
                 await fut
             except SystemExit as e:
@@ -330,6 +383,7 @@ class Mentat(agent.ThirdPartyAgent):
             except Exception as e:
                 logger.error(f"[mentat] caught {e}, exiting")
             finally:
+                executor.shutdown(wait=False)
                 await self.send_progress()
 
         await self.add_task("Mentat main loop", mentat_loop).run()
@@ -1,12 +1,12 @@
-import asyncio
 import logging
 from asyncio import Lock
 from dataclasses import dataclass
-from typing import Any, ClassVar, List, Optional
+from typing import Any, ClassVar, List, Optional, Tuple
 
 import rift.agents.registry as registry
 import rift.llm.openai_types as openai
 import rift.lsp.types as lsp
+import rift.util.asyncgen as asyncgen
 from rift.agents.abstract import AgentProgress  # AgentTask,
 from rift.agents.abstract import Agent, AgentParams, AgentRunResult, AgentState, RequestChatRequest
 from rift.agents.agenttask import AgentTask
@@ -32,6 +32,7 @@ class ChatProgress(
     AgentProgress
 ):  # reports what tasks are active and responsible for reporting new tasks
     response: Optional[str] = None
+    response_delta: Optional[str] = None
     done_streaming: bool = False
 
 
@@ -74,6 +75,15 @@ class RiftChatAgent(Agent):
         )
         return obj
 
+    def _selection_offsets(self) -> Tuple[Optional[int], Optional[int]]:
+        selection = self.state.params.selection
+        if selection is None:
+            return None, None
+        document = self.state.document
+        start = document.position_to_offset(selection.first)
+        end = document.position_to_offset(selection.second)
+        return start, end
+
     async def run(self) -> AgentRunResult:
         response_lock = Lock()
 
@@ -85,7 +95,7 @@ class RiftChatAgent(Agent):
 
         async def generate_assistant_response(user_input: str):
             # logger.info(f"generating assistant response for {user_input=}")
-            assistant_response = ""
+            assistant_chunks: List[str] = []
             documents: List[lsp.Document] = resolve_inline_uris(user_input, self.server)
             logger.info(f"resolved document uris {documents=}")
 
@@ -93,16 +103,7 @@ class RiftChatAgent(Agent):
 
             logger.info("running chat")
             with lsp.setdoc(self.state.document):
-                cursor_offset_start = (
-                    self.state.document.position_to_offset(self.state.params.selection.first)
-                    if self.state.params.selection is not None
-                    else None
-                )
-                cursor_offset_end = (
-                    self.state.document.position_to_offset(self.state.params.selection.second)
-                    if self.state.params.selection is not None
-                    else None
-                )
+                cursor_offset_start, cursor_offset_end = self._selection_offsets()
                 stream = await self.state.model.run_chat(
                     doc_text,
                     self.state.messages,
@@ -111,14 +112,16 @@ class RiftChatAgent(Agent):
                     cursor_offset_end,
                     documents=documents,
                 )
-            async for delta in stream.text:
-                assistant_response += delta
+            # Coalesce token deltas so a fast stream doesn't flood the client with progress frames.
+            async for delta in asyncgen.coalesce(stream.text):
+                assistant_chunks.append(delta)
                 # logger.info(f"{delta=}")
                 async with response_lock:
-                    await self.send_progress(ChatProgress(response=assistant_response))
+                    await self.send_progress(ChatProgress(response_delta=delta))
             if stream.event:
                 if stream.event.is_set():
                     raise Exception(f"[{self.agent_type}] generation failed")
+            assistant_response = "".join(assistant_chunks)
             await self.send_progress(ChatProgress(response=assistant_response, done_streaming=True))
             logger.info(f"{self} finished streaming response.")
             return assistant_response
@@ -133,29 +136,19 @@ class RiftChatAgent(Agent):
         self.set_tasks([get_user_input_task, old_generate_response_task])
         await old_generate_response_task.run()
         while True:
-            get_user_input_task = AgentTask("Get user input", get_user_input)
-
-            sentinel_f = asyncio.get_running_loop().create_future()
-
-            async def generate_response_task_args():
-                return [await sentinel_f]
-
-            generate_response_task = AgentTask(
-                "Generate assistant response",
-                generate_assistant_response,
-                args=generate_response_task_args,
-            )
-
+            get_user_input_task.reset()
             self.set_tasks([get_user_input_task, old_generate_response_task])
 
             await self.send_progress()
-            user_response_task = asyncio.create_task(get_user_input_task.run())
-            user_response_task.add_done_callback(lambda f: sentinel_f.set_result(f.result()))
-
-            user_response = await user_response_task
+            user_response = await get_user_input_task.run()
 
             async with response_lock:
                 self.state.messages.append(openai.Message.user(content=user_response))
+            generate_response_task = AgentTask(
+                "Generate assistant response",
+                generate_assistant_response,
+                args=[user_response],
+            )
             self.set_tasks([get_user_input_task, generate_response_task])
             await self.send_progress()
             assistant_response = await generate_response_task.run()
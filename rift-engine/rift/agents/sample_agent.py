@@ -4,7 +4,7 @@ This module provides a minimal implementation of the Agent API defined in rift.a
 import asyncio
 import logging
 from dataclasses import dataclass, field
-from typing import Any, ClassVar, Optional
+from typing import Any, ClassVar, List, Optional
 
 import rift.llm.openai_types as openai
 from rift.agents.abstract import Agent, AgentParams, AgentState, RequestChatRequest
@@ -43,7 +43,11 @@ class SampleAgent(Agent):
     agent_type: str = "sample_agent"
     params_cls: ClassVar[Any] = SampleAgentParams
     response_lock: asyncio.Lock = field(default_factory=asyncio.Lock)
-    _response_buffer: str = ""
+    _response_buffer: List[str] = field(default_factory=list)
+
+    @property
+    def response_text(self) -> str:
+        return "".join(self._response_buffer)
 
     async def run(self):
         # Send an initial update
@@ -80,20 +84,20 @@ class SampleAgent(Agent):
         :param response_stream: The stream of responses from the chat.
         """
 
-        before, after = response_stream.split_once("感")
-
-        try:
-            async with self.state.response_lock:
-                async for delta in before:
-                    self._response_buffer += delta
-                    await self.send_progress({"response": self._response_buffer})
+        while not response_stream.at_eof():
+            before, after = response_stream.split_once("感")
 
-            await asyncio.sleep(0.1)
+            try:
+                async with self.state.response_lock:
+                    async for delta in before:
+                        self._response_buffer.append(delta)
+                        await self.send_progress({"response_delta": delta})
 
-            await self._run_chat_thread(after)
+                response_stream = after
 
-        except Exception as e:
-            logger.info(f"[_run_chat_thread] caught exception={e}, exiting")
+            except Exception as e:
+                logger.info(f"[_run_chat_thread] caught exception={e}, exiting")
+                return
 
     @classmethod
     async def create(cls, params: SampleAgentParams, server):
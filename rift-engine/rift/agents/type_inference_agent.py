@@ -4,7 +4,7 @@ import os
 import re
 from dataclasses import dataclass, field
 from textwrap import dedent
-from typing import Any, ClassVar, Coroutine, Dict, List, Optional, Set, Tuple, cast
+from typing import Any, AsyncIterator, ClassVar, Coroutine, Dict, List, Optional, Set, Tuple, cast
 from urllib.parse import unquote, urlparse
 from urllib.request import url2pathname
 
@@ -64,6 +64,55 @@ Message = Dict[str, str]
 Prompt = List[Message]
 
 
+_EXAMPLE_PY = """
+    ```python
+        def foo(a: t1, b : t2) -> t3
+            ...
+    ```
+"""
+_EXAMPLE_TS = """
+    ```typescript
+        function foo(a: t1, b : t2): t3 {
+            ...
+        }
+    ```
+"""
+_EXAMPLE_OCAML = """
+    ```ocaml
+        let foo (a: t1) (b : t2) : t3 =
+            ...
+    ```
+"""
+
+
+_SYSTEM_MSG_HEADER = """
+    Act as an expert software developer.
+    For each function to modify, give an *edit block* per the example below.
+
+    You MUST format EVERY code change with an *edit block* like this:
+    """
+_SYSTEM_MSG_FOOTER = """
+    Every *edit block* must be fenced with ```...``` with the correct code language.
+    Edits to different functions each need their own *edit block*.
+    Give all the required changes at once in the reply.
+    """
+
+
+def _mk_system_msg(example: str) -> str:
+    return dedent(_SYSTEM_MSG_HEADER + example + _SYSTEM_MSG_FOOTER).lstrip()
+
+
+# system messages are built once, and selected by language
+_SYSTEM_MSG_PY = _mk_system_msg(_EXAMPLE_PY)
+_SYSTEM_MSG_TS = _mk_system_msg(_EXAMPLE_TS)
+_SYSTEM_MSG_BY_LANGUAGE: Dict[str, str] = {
+    "javascript": _SYSTEM_MSG_TS,
+    "typescript": _SYSTEM_MSG_TS,
+    "tsx": _SYSTEM_MSG_TS,
+    "ocaml": _mk_system_msg(_EXAMPLE_OCAML),
+}
+
+
 class MissingTypePrompt:
     @staticmethod
     def mk_user_msg(missing_types: List[MissingType], code: IR.Code) -> str:
@@ -95,46 +144,7 @@ class MissingTypePrompt:
     @staticmethod
     def create_prompt_for_file(language: IR.Language, missing_types: List[MissingType]) -> Prompt:
         code = MissingTypePrompt.code_for_missing_types(missing_types)
-        example_py = """
-            ```python
-                def foo(a: t1, b : t2) -> t3
-                    ...
-            ```
-        """
-        example_ts = """
-            ```typescript
-                function foo(a: t1, b : t2): t3 {
-                    ...
-                }
-            ```
-        """
-        example_ocaml = """
-            ```ocaml
-                let foo (a: t1) (b : t2) : t3 =
-                    ...
-            ```
-        """
-        if language in ["javascript", "typescript", "tsx"]:
-            example = example_ts
-        elif language == "ocaml":
-            example = example_ocaml
-        else:
-            example = example_py
-
-        system_msg = dedent(
-            """
-            Act as an expert software developer.
-            For each function to modify, give an *edit block* per the example below.
-
-            You MUST format EVERY code change with an *edit block* like this:
-            """
-            + example
-            + """
-            Every *edit block* must be fenced with ```...``` with the correct code language.
-            Edits to different functions each need their own *edit block*.
-            Give all the required changes at once in the reply.
-            """
-        ).lstrip()
+        system_msg = _SYSTEM_MSG_BY_LANGUAGE.get(language, _SYSTEM_MSG_PY)
         return [
             dict(role="system", content=system_msg),
             dict(
@@ -154,7 +164,7 @@ class FileProcess:
 
 
 def count_missing(missing_types: List[MissingType]) -> int:
-    return sum([int(mt) for mt in missing_types])
+    return sum(int(mt) for mt in missing_types)
 
 
 def get_num_missing_in_code(code: IR.Code, language: IR.Language) -> int:
@@ -234,11 +244,10 @@ class TypeInferenceAgent(agent.ThirdPartyAgent):
 
         async def feed_task():
             openai.api_key = os.environ.get("OPENAI_API_KEY")
-            completion: List[Dict[str, Any]] = openai.ChatCompletion.create(  # type: ignore
+            completion: AsyncIterator[Dict[str, Any]] = await openai.ChatCompletion.acreate(  # type: ignore
                 model=Config.model, messages=prompt, temperature=Config.temperature, stream=True
             )
-            for chunk in completion:
-                await asyncio.sleep(0.0001)
+            async for chunk in completion:
                 chunk_message_dict = chunk["choices"][0]  # type: ignore
                 chunk_message: str = chunk_message_dict["delta"].get(
                     "content"
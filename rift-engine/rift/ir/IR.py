@@ -1,7 +1,9 @@
+import functools
 import os
+import sys
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
-from typing import Callable, Dict, List, Literal, Optional, Tuple, Union
+from typing import Callable, ClassVar, Dict, Iterable, List, Literal, Optional, Tuple, Union
 
 import rift.ir.custom_parsers as custom_parsers
 
@@ -31,40 +33,80 @@ class Code:
     bytes: bytes
 
     def __str__(self):
-        return self.bytes.decode()
+        return self.text
 
     __repr__ = __str__
 
+    @functools.cached_property
+    def text(self) -> str:
+        """The whole code decoded once; the bytes never change."""
+        return self.bytes.decode()
+
+    @functools.cached_property
+    def _ascii_text(self) -> Optional[str]:
+        return self.text if self.bytes.isascii() else None
+
+    def decode_substring(self, substring: Substring) -> str:
+        """Decode the given byte range. For ASCII code, byte and character offsets coincide,
+        so the decoded text is sliced instead of decoding a fresh copy of the bytes."""
+        start, end = substring
+        text = self._ascii_text
+        if text is not None:
+            return text[start:end]
+        return self.bytes[start:end].decode()
+
     def apply_edit(self, edit: "CodeEdit") -> "Code":
         return edit.apply(self)
 
     def apply_edits(self, edits: List["CodeEdit"]) -> "Code":
-        code = self
-        # sort the edits in descending order of their start position
-        edits.sort(key=lambda x: -x.substring[0])
-        for edit in edits:
-            code = code.apply_edit(edit)
-        return code
-
-
-@dataclass
+        """Apply non-overlapping edits, all given relative to this code, in one pass.
+        Insertions at the same position end up in reverse order of `edits`."""
+        starts = [edit.substring[0] for edit in edits]
+        if all(a < b for a, b in zip(starts, starts[1:])):
+            ordered = edits  # generated edits usually arrive in document order
+        else:
+            # ascending by start; ties in reverse list order, so later insertions come first
+            order = sorted(range(len(edits)), key=lambda i: (starts[i], -i))
+            ordered = [edits[i] for i in order]
+        # slice gaps as memoryviews so the source is copied once, by the join
+        src = memoryview(self.bytes)
+        parts: List[Union[bytes, memoryview]] = []
+        cursor = 0
+        for edit in ordered:
+            start, end = edit.substring
+            if start < cursor:
+                raise ValueError(f"overlapping edit at {edit.substring}")
+            parts.append(src[cursor:start])
+            parts.append(edit.new_bytes)
+            cursor = end
+        parts.append(src[cursor:])
+        return Code(b"".join(parts))
+
+
+@dataclass(slots=True)
 class CodeEdit:
     substring: Substring
     new_bytes: bytes
 
     def apply(self, code: Code) -> Code:
         start, end = self.substring
-        return Code(code.bytes[:start] + self.new_bytes + code.bytes[end:])
+        src = memoryview(code.bytes)
+        return Code(b"".join((src[:start], self.new_bytes, src[end:])))
 
 
 Expression = str
 
 
-@dataclass
+@dataclass(slots=True)
 class Item:
     type: Optional[str] = ""
     symbol: Optional["Symbol"] = None
 
+    def __post_init__(self) -> None:
+        # node types come from a small fixed set: share one string per type
+        if self.type is not None:
+            self.type = sys.intern(self.type)
+
     def __str__(self):
         if self.symbol:
             return self.symbol.name
@@ -77,14 +119,18 @@ class Item:
 Block = List[Item]
 
 
-@dataclass
+@dataclass(slots=True)
 class Import:
     names: List[str]  # import foo, bar, baz
     substring: Substring  # the substring of the document that corresponds to this import
     module_name: Optional[str] = None  # from module_name import ...
 
+    def __post_init__(self) -> None:
+        if self.module_name is not None:
+            self.module_name = sys.intern(self.module_name)
 
-@dataclass
+
+@dataclass(slots=True)
 class Type:
     kind: Literal[
         "array", "constructor", "function", "pointer", "record", "reference", "type_of", "unknown"
@@ -92,6 +138,8 @@ class Type:
     arguments: List["Type"] = field(default_factory=list)
     fields: List["Field"] = field(default_factory=list)
     name: Optional[str] = None
+    # rendered form, filled on first str(); types are not modified once built
+    _str: Optional[str] = field(default=None, init=False, repr=False, compare=False)
 
     def array(self) -> "Type":
         return Type(kind="array", arguments=[self])
@@ -123,6 +171,11 @@ class Type:
         return Type(kind="unknown", name=s)
 
     def __str__(self) -> str:
+        if self._str is None:
+            self._str = self._render()
+        return self._str
+
+    def _render(self) -> str:
         if self.kind == "array":
             return f"{self.arguments[0]}[]"
         elif self.kind == "constructor":
@@ -148,7 +201,7 @@ class Type:
     __repr__ = __str__
 
 
-@dataclass
+@dataclass(slots=True)
 class Field:
     name: str
     optional: bool
@@ -164,7 +217,7 @@ class Field:
     __repr__ = __str__
 
 
-@dataclass
+@dataclass(slots=True)
 class Parameter:
     name: str
     default_value: Optional[str] = None
@@ -184,10 +237,14 @@ class Parameter:
     __repr__ = __str__
 
 
-@dataclass
+@dataclass(slots=True)
 class SymbolKind(ABC):
     """Abstract class for symbol kinds."""
 
+    # class-level tags so hot walkers can dispatch without isinstance checks
+    is_function: ClassVar[bool] = False
+    is_meta: ClassVar[bool] = False
+
     @abstractmethod
     def name(self) -> str:
         raise NotImplementedError
@@ -199,7 +256,7 @@ class SymbolKind(ABC):
         return None
 
 
-@dataclass
+@dataclass(slots=True)
 class MetaSymbolKind(SymbolKind):
     """
     Represents a synthetic or structural symbol in the program.
@@ -210,10 +267,10 @@ class MetaSymbolKind(SymbolKind):
     transformations.
     """
 
-    pass
+    is_meta: ClassVar[bool] = True
 
 
-@dataclass
+@dataclass(slots=True)
 class Case:
     guard: "Symbol"
     body: "Symbol"
@@ -225,7 +282,7 @@ class Case:
         return self.__str__()
 
 
-@dataclass
+@dataclass(slots=True)
 class GuardKind(MetaSymbolKind):
     """Guard of a conditional"""
 
@@ -244,7 +301,7 @@ class GuardKind(MetaSymbolKind):
         return self.__str__()
 
 
-@dataclass
+@dataclass(slots=True)
 class BodyKind(MetaSymbolKind):
     """Body of a branch"""
 
@@ -263,7 +320,7 @@ class BodyKind(MetaSymbolKind):
         return self.__str__()
 
 
-@dataclass
+@dataclass(slots=True)
 class CallKind(MetaSymbolKind):
     function_name: str
     arguments: List[Expression]
@@ -283,7 +340,7 @@ class CallKind(MetaSymbolKind):
         return self.__str__()
 
 
-@dataclass
+@dataclass(slots=True)
 class ExpressionKind(MetaSymbolKind):
     """Expression statement"""
 
@@ -302,7 +359,7 @@ class ExpressionKind(MetaSymbolKind):
         return self.__str__()
 
 
-@dataclass
+@dataclass(slots=True)
 class IfKind(MetaSymbolKind):
     if_case: Case
     elif_cases: List[Case]
@@ -330,8 +387,10 @@ class IfKind(MetaSymbolKind):
         return self.__str__()
 
 
-@dataclass
+@dataclass(slots=True)
 class FunctionKind(SymbolKind):
+    is_function: ClassVar[bool] = True
+
     has_return: bool
     parameters: List[Parameter]
     return_type: Optional[Type] = None
@@ -348,7 +407,7 @@ class FunctionKind(SymbolKind):
             lines.append(f"   has_return: {self.has_return}")
 
 
-@dataclass
+@dataclass(slots=True)
 class ValueKind(SymbolKind):
     type: Optional[Type] = None
 
@@ -360,7 +419,7 @@ class ValueKind(SymbolKind):
             lines.append(f"   type: {self.type}")
 
 
-@dataclass
+@dataclass(slots=True)
 class TypeDefinitionKind(SymbolKind):
     type: Optional[Type] = None
 
@@ -378,13 +437,13 @@ class TypeDefinitionKind(SymbolKind):
             return f"{self.type}"
 
 
-@dataclass
+@dataclass(slots=True)
 class InterfaceKind(SymbolKind):
     def name(self) -> str:
         return "Interface"
 
 
-@dataclass
+@dataclass(slots=True)
 class ClassKind(SymbolKind):
     superclasses: Optional[str]
 
@@ -396,24 +455,25 @@ class ClassKind(SymbolKind):
             return self.superclasses
 
 
-@dataclass
+@dataclass(slots=True)
 class NamespaceKind(SymbolKind):
     def name(self) -> str:
         return "Namespace"
 
 
-@dataclass
+@dataclass(slots=True)
 class ModuleKind(SymbolKind):
     def name(self) -> str:
         return "Module"
 
 
-@dataclass
+@dataclass(slots=True)
 class Symbol:
     """Class for symbol information."""
 
     body: Block
-    body_sub: Optional[Substring]
+    body_start: int  # -1 when the symbol has no body
+    body_end: int
     code: Code
     docstring_sub: Optional[Substring]
     exported: bool
@@ -422,34 +482,77 @@ class Symbol:
     range: Range
     parent: Optional["Symbol"]  # parent symbol in terms of control flow
     scope: Scope
-    substring: Substring
+    substring_start: int
+    substring_end: int
     symbol_kind: SymbolKind
+    _qid: QualifiedId = field(init=False, repr=False, compare=False)
+    # lazily filled caches; the symbol's code never changes after parsing
+    _sub: Optional[bytes] = field(default=None, init=False, repr=False, compare=False)
+    _sub_without_body: Optional[bytes] = field(default=None, init=False, repr=False, compare=False)
+    _decl: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    _kind: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    # dump() output, reset by File.add_symbol when a child is added to the body
+    _dump: Optional[List[str]] = field(default=None, init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        # many symbols share a scope or a name (e.g. methods); language values are
+        # already interned literals
+        self.name = sys.intern(self.name)
+        self.scope = sys.intern(self.scope)
+        self._qid = self.scope + self.name
+
+    @property
+    def substring(self) -> Substring:
+        return (self.substring_start, self.substring_end)
+
+    @property
+    def body_sub(self) -> Optional[Substring]:
+        if self.body_start < 0:
+            return None
+        return (self.body_start, self.body_end)
 
     # return the substring of the document that corresponds to this symbol info
     def get_substring(self) -> bytes:
-        start, end = self.substring
-        return self.code.bytes[start:end]
+        if self._sub is None:
+            self._sub = self.code.bytes[self.substring_start : self.substring_end]
+        return self._sub
 
     def get_qualified_id(self) -> QualifiedId:
-        return self.scope + self.name
+        return self._qid
 
     def get_substring_without_body(self) -> bytes:
-        if self.body_sub is None:
-            return self.get_substring()
+        if self._sub_without_body is None:
+            start, end = self.substring_without_body()
+            self._sub_without_body = self.code.bytes[start:end]
+        return self._sub_without_body
+
+    def get_decl_without_body(self) -> str:
+        """The declaration without its body, decoded and stripped.
+        Cached: the symbol's code is immutable, edits always produce a new Code."""
+        if self._decl is None:
+            self._decl = self.code.decode_substring(self.substring_without_body()).strip()
+        return self._decl
+
+    def substring_without_body(self) -> Substring:
+        if self.body_start < 0:
+            return (self.substring_start, self.substring_end)
         else:
-            start, _end = self.substring
-            body_start, _body_end = self.body_sub
-            return self.code.bytes[start:body_start]
+            return (self.substring_start, self.body_start)
 
     @property
     def docstring(self) -> Optional[str]:
         if self.docstring_sub is None:
             return None
         else:
-            start, end = self.docstring_sub
-            return self.code.bytes[start:end].decode()
+            return self.code.decode_substring(self.docstring_sub)
 
     def dump(self, lines: List[str]) -> None:
+        if self._dump is None:
+            self._dump = []
+            self._dump_uncached(self._dump)
+        lines.extend(self._dump)
+
+    def _dump_uncached(self, lines: List[str]) -> None:
         signature = self.symbol_kind.signature()
         if signature is not None:
             id = self.name + signature
@@ -464,7 +567,7 @@ class Symbol:
             lines.append(f"   docstring: {self.docstring}")
         if self.exported:
             lines.append(f"   exported: {self.exported}")
-        if self.body_sub is not None:
+        if self.body_start >= 0:
             lines.append(f"   body_sub: {self.body_sub}")
         if self.body != []:
             lines.append(f"   body: {self.body}")
@@ -473,73 +576,93 @@ class Symbol:
         self.symbol_kind.dump(lines)
 
     def kind(self) -> str:
-        return self.symbol_kind.name()
+        # symbol_kind is only replaced while the parser builds the symbol, before any lookup
+        if self._kind is None:
+            self._kind = self.symbol_kind.name()
+        return self._kind
 
 
-@dataclass
+@functools.cache
+def _indent(indent: int) -> str:
+    """Shared whitespace prefix for dumps; only a handful of depths ever occur."""
+    return " " * indent
+
+
+@dataclass(slots=True)
 class File:
     path: str  # path of the file relative to the root directory
     statements: List[Item] = field(default_factory=list)
     _imports: List[Import] = field(default_factory=list)
     _symbol_table: Dict[QualifiedId, Symbol] = field(default_factory=dict)
+    # secondary indexes over _symbol_table, maintained by add_symbol
+    _symbols_by_name: Dict[str, Dict[QualifiedId, Symbol]] = field(default_factory=dict)
+    _functions: Dict[QualifiedId, Symbol] = field(default_factory=dict)
+    # first import of each module, maintained by add_import
+    _imports_by_module: Dict[str, Import] = field(default_factory=dict)
 
     def lookup_symbol(self, qid: QualifiedId) -> Optional[Symbol]:
         return self._symbol_table.get(qid)
 
+    def iter_symbols(self) -> Iterable[Symbol]:
+        return self._symbol_table.values()
+
     def search_symbol(self, name: Union[str, Callable[[str], bool]]) -> List[Symbol]:
         if callable(name):
             name_filter = name
             return [symbol for symbol in self._symbol_table.values() if name_filter(symbol.name)]
         else:
-            return [symbol for symbol in self._symbol_table.values() if symbol.name == name]
+            return list(self._symbols_by_name.get(name, {}).values())
 
     def search_module_import(self, module_name: str) -> Optional[Import]:
-        for import_ in self._imports:
-            if import_.module_name == module_name:
-                return import_
-        return None
+        return self._imports_by_module.get(module_name)
 
     def add_symbol(self, symbol: Symbol) -> None:
         if symbol.parent:
             symbol.parent.body.append(Item(symbol=symbol))
-        self._symbol_table[symbol.get_qualified_id()] = symbol
+            symbol.parent._dump = None
+        qid = symbol._qid
+        old_symbol = self._symbol_table.get(qid)
+        if old_symbol is not None and old_symbol.name != symbol.name:
+            del self._symbols_by_name[old_symbol.name][qid]
+        self._symbol_table[qid] = symbol
+        self._symbols_by_name.setdefault(symbol.name, {})[qid] = symbol
+        if symbol.symbol_kind.is_function:
+            self._functions[qid] = symbol
+        else:
+            self._functions.pop(qid, None)
 
     def add_import(self, import_: Import) -> None:
         self._imports.append(import_)
+        if import_.module_name is not None:
+            self._imports_by_module.setdefault(import_.module_name, import_)
 
     def get_function_declarations(self) -> List[Symbol]:
-        return [
-            symbol
-            for symbol in self._symbol_table.values()
-            if isinstance(symbol.symbol_kind, FunctionKind)
-        ]
+        return list(self._functions.values())
 
     def dump_symbol_table(self, lines: List[str]) -> None:
-        for id in self._symbol_table:
-            d = self._symbol_table[id]
-            d.dump(lines)
+        for symbol in self._symbol_table.values():
+            symbol.dump(lines)
 
     def dump_map(self, indent: int, lines: List[str]) -> None:
-        def dump_symbol(symbol: Symbol, indent: int) -> None:
-            if not isinstance(symbol.symbol_kind, MetaSymbolKind):
-                decl_without_body = symbol.get_substring_without_body().decode().strip()
-                # indent the declaration
-                decl_without_body = decl_without_body.replace("\n", "\n" + " " * indent)
-                lines.append(f"{' ' * indent}{decl_without_body}")
+        # walk the statements depth-first with an explicit stack instead of recursing per node
+        append = lines.append
+        stack = [(statement, indent) for statement in reversed(self.statements)]
+        while stack:
+            statement, indent = stack.pop()
+            symbol = statement.symbol
+            if symbol is None:
+                continue
+            prefix = _indent(indent)
+            if not symbol.symbol_kind.is_meta:
+                decl_without_body = symbol.get_decl_without_body()
+                # indent each line of the declaration, as its own entry in lines
+                lines.extend(prefix + line for line in decl_without_body.split("\n"))
             else:
-                lines.append(f"{' ' * indent}{symbol.name} = `{symbol.symbol_kind}`")
-            for statement in symbol.body:
-                dump_statement(statement, indent + 2)
+                append(f"{prefix}{symbol.name} = `{symbol.symbol_kind}`")
+            stack.extend((child, indent + 2) for child in reversed(symbol.body))
 
-        def dump_statement(statement: Item, indent: int) -> None:
-            if statement.symbol:
-                dump_symbol(statement.symbol, indent)
 
-        for statement in self.statements:
-            dump_statement(statement, indent)
-
-
-@dataclass
+@dataclass(slots=True)
 class Reference:
     """
     A reference to a file, and optionally a symbol inside that file.
@@ -565,31 +688,35 @@ class Reference:
     @staticmethod
     def from_uri(uri: str) -> "Reference":
         # split uri on first '#' character
-        split = uri.split("#", 1)
-        file_path = split[0]
-        qualified_id = split[1] if len(split) > 1 else None
-        return Reference(file_path=file_path, qualified_id=qualified_id)
+        file_path, sep, qualified_id = uri.partition("#")
+        return Reference(file_path=file_path, qualified_id=qualified_id if sep else None)
 
 
-@dataclass
+@dataclass(slots=True)
 class ResolvedReference:
     file: File
     symbol: Optional[Symbol] = None
 
 
-@dataclass
+def _normalize_path(path: str) -> str:
+    """Normalize separators, "." / ".." segments and (on Windows) case for path lookups."""
+    return os.path.normpath(os.path.normcase(path))
+
+
+@dataclass(slots=True)
 class Project:
     root_path: str
     _files: List[File] = field(default_factory=list)
+    # normalized absolute path -> file; the first file added for a path wins
+    _files_by_path: Dict[str, File] = field(default_factory=dict, repr=False, compare=False)
 
     def add_file(self, file: File):
         self._files.append(file)
+        key = _normalize_path(os.path.join(self.root_path, file.path))
+        self._files_by_path.setdefault(key, file)
 
     def lookup_file(self, path: str) -> Optional[File]:
-        for file in self._files:
-            if os.path.join(self.root_path, file.path) == path:
-                return file
-        return None
+        return self._files_by_path.get(_normalize_path(path))
 
     def lookup_reference(self, reference: Reference) -> Optional[ResolvedReference]:
         file = self.lookup_file(reference.file_path)
@@ -604,40 +731,38 @@ class Project:
         return self._files
 
     def dump_map(self, indent: int = 0) -> str:
+        # one shared list for every file, joined once at the end
         lines: List[str] = []
+        prefix = _indent(indent)
         for file in self.get_files():
-            lines.append(f"{' ' * indent}File: {file.path}")
+            lines.append(f"{prefix}File: {file.path}")
             file.dump_map(indent + 2, lines)
         return "\n".join(lines)
 
 
+_EXTENSION_TO_LANGUAGE: Dict[str, Language] = {
+    ".c": "c",
+    ".cpp": "cpp",
+    ".cc": "cpp",
+    ".cxx": "cpp",
+    ".c++": "cpp",
+    ".cs": "c_sharp",
+    ".js": "javascript",
+    ".java": "java",
+    ".ml": "ocaml",
+    ".py": "python",
+    ".res": "rescript",
+    ".ts": "typescript",
+    ".tsx": "tsx",
+    ".rb": "ruby",
+}
+
+
 def language_from_file_extension(file_path: str) -> Optional[Language]:
-    if file_path.endswith(".c"):
-        return "c"
-    elif (
-        file_path.endswith(".cpp")
-        or file_path.endswith(".cc")
-        or file_path.endswith(".cxx")
-        or file_path.endswith(".c++")
-    ):
-        return "cpp"
-    elif file_path.endswith(".cs"):
-        return "c_sharp"
-    elif file_path.endswith(".js"):
-        return "javascript"
-    elif file_path.endswith(".java"):
-        return "java"
-    elif file_path.endswith(".ml"):
-        return "ocaml"
-    elif file_path.endswith(".py"):
-        return "python"
-    elif file_path.endswith(".res") and custom_parsers.active:
-        return "rescript"
-    elif file_path.endswith(".ts"):
-        return "typescript"
-    elif file_path.endswith(".tsx"):
-        return "tsx"
-    elif file_path.endswith(".rb"):
-        return "ruby"
-    else:
+    dot = file_path.rfind(".")
+    if dot < 0:
+        return None
+    language = _EXTENSION_TO_LANGUAGE.get(file_path[dot:])
+    if language == "rescript" and not custom_parsers.active:
         return None
+    return language
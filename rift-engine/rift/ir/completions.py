@@ -1,39 +1,28 @@
 import json
-from dataclasses import asdict, dataclass
-from typing import Dict, List
+from typing import Any, Dict, List
 
 import rift.ir.IR as IR
 
 
-@dataclass
-class Symbol:
-    name: str
-    scope: str
-    kind: str
-    range: IR.Range
-
-
-@dataclass
-class File:
-    path: str
-    symbols: List[Symbol]
-
-
 def get_symbol_completions(project: IR.Project) -> str:
     return json.dumps(get_symbol_completions_raw(project), indent=4)
 
 
-def get_symbol_completions_raw(project: IR.Project) -> List[Dict[str, Symbol]]:
-    files: List[File] = []
+def get_symbol_completions_raw(project: IR.Project) -> List[Dict[str, Any]]:
+    """One entry per file: {"path": ..., "symbols": [{"name", "scope", "kind", "range"}, ...]}."""
+    files: List[Dict[str, Any]] = []
     for file_ir in project.get_files():
-        symbols: List[Symbol] = []
-        for symbol in file_ir.search_symbol(lambda _: True):
-            if isinstance(symbol.symbol_kind, IR.MetaSymbolKind):
+        symbols: List[Dict[str, Any]] = []
+        for symbol in file_ir.iter_symbols():
+            if symbol.symbol_kind.is_meta:
                 continue # don't emit completions for statements inside bodies
-            symbol = Symbol(
-                symbol.name, symbol.scope, symbol.kind(), symbol.range
+            symbols.append(
+                {
+                    "name": symbol.name,
+                    "scope": symbol.scope,
+                    "kind": symbol.kind(),
+                    "range": symbol.range,
+                }
             )
-            symbols.append(symbol)
-        file = File(file_ir.path, symbols)
-        files.append(file)
-    return [asdict(symbol) for symbol in files]
+        files.append({"path": file_ir.path, "symbols": symbols})
+    return files
@@ -1,9 +1,15 @@
 from dataclasses import dataclass
-from typing import List
+from typing import FrozenSet, List
 
 import rift.ir.IR as IR
 
 
+# languages whose functions are checked for doc strings
+DOCSTRING_LANGUAGES: FrozenSet[IR.Language] = frozenset(
+    ["javascript", "ocaml", "python", "rescript", "tsx", "typescript"]
+)
+
+
 @dataclass
 class FunctionMissingDocstring:
     function_declaration: IR.Symbol
@@ -24,14 +30,7 @@ def functions_missing_docstrings_in_file(file_name: IR.File) -> List[FunctionMis
     functions_missing_docstrings: List[FunctionMissingDocstring] = []
     function_declarations = file_name.get_function_declarations()
     for function in function_declarations:
-        if function.language not in [
-            "javascript",
-            "ocaml",
-            "python",
-            "rescript",
-            "tsx",
-            "typescript",
-        ]:
+        if function.language not in DOCSTRING_LANGUAGES:
             continue
         if not function.docstring:
             functions_missing_docstrings.append(FunctionMissingDocstring(function))
@@ -51,7 +50,7 @@ def files_missing_docstrings_in_project(project: IR.Project) -> List[FileMissing
     files_with_missing_docstrings: List[FileMissingDocstrings] = []
     for file_name in project.get_files():
         functions_missing_docstrings = functions_missing_docstrings_in_file(file_name)
-        if functions_missing_docstrings != []:
+        if functions_missing_docstrings:
             file_decl = functions_missing_docstrings[0].function_declaration
             language = file_decl.language
             file_code = file_decl.code
@@ -1,11 +1,23 @@
 import os
 from dataclasses import dataclass, field
-from typing import List, Tuple
+from typing import FrozenSet, List, Tuple
 
 import rift.ir.IR as IR
 import rift.ir.parser as parser
 
 
+# languages whose functions are checked for missing types
+TYPED_LANGUAGES: FrozenSet[IR.Language] = frozenset(
+    ["javascript", "ocaml", "python", "rescript", "tsx", "typescript"]
+)
+# a missing return type is only reported for functions that return a value
+RETURN_TYPE_IF_RETURNS_LANGUAGES: FrozenSet[IR.Language] = frozenset(
+    ["javascript", "typescript", "tsx"]
+)
+# a missing return type is always reported
+RETURN_TYPE_ALWAYS_LANGUAGES: FrozenSet[IR.Language] = frozenset(["ocaml", "python"])
+
+
 @dataclass
 class MissingType:
     function_declaration: IR.Symbol
@@ -37,7 +49,7 @@ def functions_missing_types_in_file(file: IR.File) -> List[MissingType]:
     functions_missing_types: List[MissingType] = []
     function_declarations = file.get_function_declarations()
     for d in function_declarations:
-        if d.language not in ["javascript", "ocaml", "python", "rescript", "tsx", "typescript"]:
+        if d.language not in TYPED_LANGUAGES:
             continue
         function_kind = d.symbol_kind
         if not isinstance(function_kind, IR.FunctionKind):
@@ -56,10 +68,10 @@ def functions_missing_types_in_file(file: IR.File) -> List[MissingType]:
                 if p.type is None:
                     missing_parameters.append(p.name)
         if function_kind.return_type is None:
-            if d.language in ["javascript", "typescript", "tsx"]:
+            if d.language in RETURN_TYPE_IF_RETURNS_LANGUAGES:
                 if function_kind.has_return:
                     missing_return = True
-            elif d.language in ["ocaml", "python"]:
+            elif d.language in RETURN_TYPE_ALWAYS_LANGUAGES:
                 missing_return = True
         if missing_parameters != [] or missing_return:
             functions_missing_types.append(
@@ -104,7 +116,7 @@ def files_missing_types_in_project(project: IR.Project) -> List[FileMissingTypes
     files_with_missing_types: List[FileMissingTypes] = []
     for file in project.get_files():
         missing_types = functions_missing_types_in_file(file)
-        if missing_types != []:
+        if missing_types:
             decl = missing_types[0].function_declaration
             language = decl.language
             code = decl.code
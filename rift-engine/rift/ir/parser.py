@@ -1,5 +1,7 @@
+import asyncio
 import os
-from typing import Callable, List, Optional
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
 
 from tree_sitter import Parser
 from tree_sitter_languages import get_parser as get_tree_sitter_parser
@@ -11,7 +13,8 @@ import rift.ir.parser_core as parser_core
 
 def get_parser(language: IR.Language) -> Parser:
     if language == "rescript" and custom_parser.active:
-        parser = custom_parser.parser
+        # use a fresh parser, so that files can be parsed concurrently from several threads
+        parser = Parser()
         parser.set_language(custom_parser.ReScript)
         return parser
     else:
@@ -36,6 +39,51 @@ def parse_code_block(
         file.statements.extend(items)
 
 
+# cache of parsed files, keyed by (path, root_path, mtime_ns, size)
+ParseCacheKey = Tuple[str, str, int, int]
+_parse_cache: Dict[ParseCacheKey, IR.File] = {}
+# parse_file runs in worker threads (see parse_files_in_paths_async)
+_parse_cache_lock = threading.Lock()
+PARSE_CACHE_MAX_SIZE = 256
+
+
+def parse_file(
+    path: str, root_path: str, language: Optional[IR.Language] = None
+) -> Optional[IR.File]:
+    """
+    Parses a single file, with path relative to root_path in the result.
+    Returns None if the language of the file is not known.
+    Callers that already classified the path can pass its language to skip doing it again.
+    Files that did not change on disk since the last call are returned from a cache,
+    so the same File object is shared between callers: treat it as read-only.
+    """
+    if language is None:
+        language = IR.language_from_file_extension(path)
+    if language is None:
+        return None
+    stat = os.stat(path)
+    key = (path, root_path, stat.st_mtime_ns, stat.st_size)
+    with _parse_cache_lock:
+        file_ir = _parse_cache.get(key)
+    if file_ir is not None:
+        return file_ir
+    path_from_root = os.path.relpath(path, root_path)
+    with open(path, "r", encoding="utf-8") as f:
+        code = IR.Code(f.read().encode("utf-8"))
+    file_ir = IR.File(path=path_from_root)
+    parse_code_block(file=file_ir, code=code, language=language)
+    with _parse_cache_lock:
+        cached = _parse_cache.get(key)
+        if cached is not None:
+            # another thread parsed the same file meanwhile: share its result
+            return cached
+        if len(_parse_cache) >= PARSE_CACHE_MAX_SIZE:
+            # evict the oldest entry
+            _parse_cache.pop(next(iter(_parse_cache)), None)
+        _parse_cache[key] = file_ir
+    return file_ir
+
+
 def parse_path(
     path: str, project: IR.Project, filter_file: Optional[Callable[[str], bool]] = None
 ) -> None:
@@ -44,34 +92,67 @@ def parse_path(
     """
     language = IR.language_from_file_extension(path)
     if language is not None and (filter_file is None or filter_file(path)):
-        path_from_root = os.path.relpath(path, project.root_path)
-        with open(path, "r", encoding="utf-8") as f:
-            code = IR.Code(f.read().encode("utf-8"))
-        file_ir = IR.File(path=path_from_root)
-        parse_code_block(file=file_ir, code=code, language=language)
-        project.add_file(file=file_ir)
+        file_ir = parse_file(path, project.root_path, language)
+        if file_ir is not None:
+            project.add_file(file=file_ir)
 
 
-def parse_files_in_paths(
-    paths: List[str], filter_file: Optional[Callable[[str], bool]] = None
-) -> IR.Project:
-    """
-    Parses all files with known extensions in the provided list of paths.
-    """
+def get_root_path(paths: List[str]) -> str:
     if len(paths) == 0:
         raise Exception("No paths provided")
     if len(paths) == 1 and os.path.isfile(paths[0]):
-        root_path = os.path.dirname(paths[0])
+        return os.path.dirname(paths[0])
     else:
-        root_path = os.path.commonpath(paths)
-    project = IR.Project(root_path=root_path)
+        return os.path.commonpath(paths)
+
+
+def files_in_paths(paths: List[str]) -> List[str]:
+    """
+    Returns the files in the provided list of paths, walking directories recursively.
+    """
+    files_: List[str] = []
     for path in paths:
         if os.path.isfile(path):
-            parse_path(path, project, filter_file)
+            files_.append(path)
         else:
             for root, dirs, files in os.walk(path):
                 dirs[:] = [d for d in dirs if d not in ["node_modules", ".git"]]
                 for file in files:
-                    full_path = os.path.join(root, file)
-                    parse_path(full_path, project, filter_file)
+                    files_.append(os.path.join(root, file))
+    return files_
+
+
+def parse_files_in_paths(
+    paths: List[str], filter_file: Optional[Callable[[str], bool]] = None
+) -> IR.Project:
+    """
+    Parses all files with known extensions in the provided list of paths.
+    """
+    project = IR.Project(root_path=get_root_path(paths))
+    for path in files_in_paths(paths):
+        parse_path(path, project, filter_file)
+    return project
+
+
+async def parse_files_in_paths_async(
+    paths: List[str], filter_file: Optional[Callable[[str], bool]] = None
+) -> IR.Project:
+    """
+    Like parse_files_in_paths, but parses the files concurrently in worker threads.
+    """
+    project = IR.Project(root_path=get_root_path(paths))
+    files: List[Tuple[str, IR.Language]] = []
+    for path in files_in_paths(paths):
+        language = IR.language_from_file_extension(path)
+        if language is not None and (filter_file is None or filter_file(path)):
+            files.append((path, language))
+    files_ir = await asyncio.gather(
+        *[
+            asyncio.to_thread(parse_file, path, project.root_path, language)
+            for path, language in files
+        ]
+    )
+    for file_ir in files_ir:
+        if file_ir is not None:
+            project.add_file(file=file_ir)
     return project
@@ -298,9 +298,11 @@ class SymbolParser:
             name = id.text.decode()
         if body is None:
             body = []
+        body_start, body_end = (-1, -1) if self.body_sub is None else self.body_sub
         return Symbol(
             body=body,
-            body_sub=self.body_sub,
+            body_start=body_start,
+            body_end=body_end,
             code=self.code,
             docstring_sub=self.docstring_sub,
             exported=self.exported,
@@ -309,7 +311,8 @@ class SymbolParser:
             parent=self.parent,
             range=(parents[0].start_point, parents[-1].end_point),
             scope=self.scope,
-            substring=(parents[0].start_byte, parents[-1].end_byte),
+            substring_start=parents[0].start_byte,
+            substring_end=parents[-1].end_byte,
             symbol_kind=symbol_kind,
         )
 
@@ -1036,11 +1039,11 @@ class SymbolParser:
         symbols = [item.symbol for item in self.parent.body if item.symbol is not None]
 
         # Sort the symbols based on their starting substring index in descending order for accurate replacement
-        sorted_symbols = sorted(symbols, key=lambda s: s.substring[0], reverse=True)
+        sorted_symbols = sorted(symbols, key=lambda s: s.substring_start, reverse=True)
 
         # Replace each symbol in the code with its name
         for symbol in sorted_symbols:
-            start, end = symbol.substring
+            start, end = symbol.substring_start, symbol.substring_end
             # Adjust start and end based on the node's starting byte
             start -= self.node.start_byte
             end -= self.node.start_byte
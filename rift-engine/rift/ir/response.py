@@ -1,7 +1,7 @@
 from enum import Enum
 import re
 import textwrap
-from typing import List, Optional, Set, Tuple
+from typing import Collection, List, Optional, Set, Tuple
 
 import rift.ir.IR as IR
 import rift.ir.parser as parser
@@ -11,6 +11,56 @@ import logging
 logger = logging.getLogger(__name__)
 
 
+class CodeBlockExtractor:
+    """
+    Incrementally extract code blocks from a response that arrives in chunks.
+
+    Complete blocks are returned by `feed` as soon as their closing fence has been received.
+    """
+
+    def __init__(self) -> None:
+        self._pending: str = ""  # last line received, not terminated yet
+        self._block_lines: List[str] = []
+        self._inside_code_block = False
+
+    def _feed_line(self, line: str) -> Optional[IR.Code]:
+        if line.startswith("```"):
+            if self._inside_code_block:
+                block = "".join(self._block_lines)
+                self._block_lines = []
+                self._inside_code_block = False
+                return IR.Code(block.encode("utf-8"))
+            else:
+                self._inside_code_block = True
+        elif self._inside_code_block:
+            self._block_lines.append(line + "\n")
+        return None
+
+    def _feed_lines(self, lines: List[str]) -> List[IR.Code]:
+        code_blocks: List[IR.Code] = []
+        for line in lines:
+            block = self._feed_line(line)
+            if block is not None:
+                code_blocks.append(block)
+        return code_blocks
+
+    def feed(self, text: str) -> List[IR.Code]:
+        """Feed a chunk of the response, and return the code blocks completed by it."""
+        lines = (self._pending + text).splitlines(keepends=True)
+        # keep the last line if it is not terminated, or if it could be the "\r" of a "\r\n"
+        if lines and (lines[-1].splitlines()[0] == lines[-1] or lines[-1].endswith("\r")):
+            self._pending = lines.pop()
+        else:
+            self._pending = ""
+        return self._feed_lines([line.splitlines()[0] for line in lines])
+
+    def feed_eof(self) -> List[IR.Code]:
+        """Signal the end of the response, and return the code blocks completed by it."""
+        lines = self._pending.splitlines()
+        self._pending = ""
+        return self._feed_lines(lines)
+
+
 def extract_blocks_from_response(response: str) -> List[IR.Code]:
     """
     Extract code blocks from a response string.
@@ -21,21 +71,8 @@ def extract_blocks_from_response(response: str) -> List[IR.Code]:
     Returns:
         List[Code]: A list of code blocks.
     """
-    code_blocks_str: List[str] = []
-    current_block: str = ""
-    inside_code_block = False
-    for line in response.splitlines():
-        if line.startswith("```"):
-            if inside_code_block:
-                code_blocks_str.append(current_block)
-                current_block = ""
-                inside_code_block = False
-            else:
-                inside_code_block = True
-        elif inside_code_block:
-            current_block += line + "\n"
-    code_blocks = [IR.Code(block.encode("utf-8")) for block in code_blocks_str]
-    return code_blocks
+    extractor = CodeBlockExtractor()
+    return extractor.feed(response) + extractor.feed_eof()
 
 
 def parse_code_blocks(code_blocks: List[IR.Code], language: IR.Language) -> IR.File:
@@ -75,7 +112,7 @@ def replace_functions_in_document(
     ir_doc: IR.File,
     ir_blocks: IR.File,
     replace: Replace,
-    filter_function_ids: Optional[List[IR.QualifiedId]] = None,
+    filter_function_ids: Optional[Collection[IR.QualifiedId]] = None,
 ) -> Tuple[List[IR.CodeEdit], List[IR.Symbol]]:
     """
     Replaces functions in the document with corresponding functions from parsed blocks.
@@ -206,13 +243,32 @@ def replace_functions_from_code_blocks(
     document: IR.Code,
     language: IR.Language,
     replace: Replace,
-    filter_function_ids: Optional[List[IR.QualifiedId]] = None,
+    filter_function_ids: Optional[Collection[IR.QualifiedId]] = None,
 ) -> Tuple[List[IR.CodeEdit], List[IR.Symbol]]:
     """
     Generates a new document by replacing functions in the original document with the corresponding functions
     from the code blocks.
     """
     ir_blocks = parse_code_blocks(code_blocks=code_blocks, language=language)
+    return replace_functions_from_ir_blocks(
+        ir_blocks=ir_blocks,
+        document=document,
+        language=language,
+        replace=replace,
+        filter_function_ids=filter_function_ids,
+    )
+
+
+def replace_functions_from_ir_blocks(
+    ir_blocks: IR.File,
+    document: IR.Code,
+    language: IR.Language,
+    replace: Replace,
+    filter_function_ids: Optional[Collection[IR.QualifiedId]] = None,
+) -> Tuple[List[IR.CodeEdit], List[IR.Symbol]]:
+    """
+    Like replace_functions_from_code_blocks, for code blocks that have already been parsed.
+    """
     ir_doc = parse_code_blocks(code_blocks=[document], language=language)
     code_edits, updated_functions = replace_functions_in_document(
         filter_function_ids=filter_function_ids,
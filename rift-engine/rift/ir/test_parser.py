@@ -1,3 +1,4 @@
+import asyncio
 import difflib
 import os
 from textwrap import dedent
@@ -392,3 +393,13 @@ def test_parsing():
         assert (
             update_symbol_table
         ), f"Symbol Table has changed (to update set `UPDATE_TESTS=True`):\n\n{diff_output}"
+
+
+def test_parse_files_in_paths_async():
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    project = parser.parse_files_in_paths([script_dir])
+    project_async = asyncio.run(parser.parse_files_in_paths_async([script_dir]))
+    assert [file.path for file in project_async.get_files()] == [
+        file.path for file in project.get_files()
+    ]
+    assert project_async.dump_map() == project.dump_map()
@@ -373,3 +373,13 @@ def test_response():
         assert (
             update_missing_types
         ), f"Missing Types have changed (to update set `UPDATE_TESTS=True`):\n\n{diff_output}"
+
+
+def test_code_block_extractor():
+    for text in [Test.response1, Test.response2, Test.response3, Test.response4, Test.response5]:
+        extractor = response.CodeBlockExtractor()
+        code_blocks = []
+        for i in range(0, len(text), 7):
+            code_blocks.extend(extractor.feed(text[i : i + 7]))
+        code_blocks.extend(extractor.feed_eof())
+        assert code_blocks == response.extract_blocks_from_response(text)
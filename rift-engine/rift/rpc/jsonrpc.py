@@ -14,7 +14,7 @@ from enum import Enum
 from functools import partial, singledispatch
 from typing import Any, Optional, Union
 
-from rift.util.ofdict import MyJsonEncoder, ofdict, todict, todict_dataclass
+from rift.util.ofdict import MyJsonEncoder, ofdict, todict, todict_dataclass, todict_key
 
 from .transport import Transport, TransportClosedError, TransportClosedOK, TransportError
 
@@ -70,6 +70,31 @@ class ErrorCode(Enum):
 
 encoder = MyJsonEncoder()
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _orjson_default(o):
+    return todict(o)
+
+
+def encode_json(obj: Any) -> bytes:
+    """Encode `obj` as JSON bytes, using orjson when it is installed and MyJsonEncoder otherwise."""
+    if orjson is not None:
+        if isinstance(obj, dict):
+            obj = {todict_key(k): v for k, v in obj.items()}
+        return orjson.dumps(
+            obj,
+            default=_orjson_default,
+            # route these through `todict` so that the output matches MyJsonEncoder
+            option=orjson.OPT_PASSTHROUGH_DATACLASS
+            | orjson.OPT_PASSTHROUGH_DATETIME
+            | orjson.OPT_NON_STR_KEYS,
+        )
+    return encoder.encode(obj).encode()
+
 
 @dataclass
 class Request:
@@ -92,7 +117,7 @@ class Request:
 
     def to_bytes(self):
         """Encode the request as bytes. Note that this will automatically convert Python objects to JSON using MyJsonEncoder."""
-        return encoder.encode(self).encode()
+        return encode_json(self)
 
     def __str__(self):
         if self.id is None:
@@ -172,7 +197,7 @@ class Response:
         return d
 
     def to_bytes(self):
-        return encoder.encode(self).encode()
+        return encode_json(self)
 
 
 class Dispatcher:
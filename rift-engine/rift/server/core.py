@@ -173,6 +173,18 @@ def create_metaserver(
     return metaserver
 
 
+def install_uvloop():
+    """Use uvloop's event loop when it is installed (`pip install pyrift[uvloop]`)."""
+    if sys.platform == "win32":
+        return
+    try:
+        import uvloop
+    except ImportError:
+        return
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    logger.info("using uvloop event loop")
+
+
 def main(
     host: LspHost = "127.0.0.1",
     port: LspPort = 7797,
@@ -185,6 +197,7 @@ def main(
         logger.info(f"setting port={int(socket)}")
     metaserver = create_metaserver(host, port, version, debug)
     if metaserver:
+        install_uvloop()
         asyncio.run(metaserver.run_forever(), debug=debug)
 
 
@@ -12,20 +12,31 @@ class TextStream:
     _buffer: str  # [todo] use io.StringIO
     _loop: asyncio.AbstractEventLoop
     _on_cancel: Optional[Callable[[], None]]
+    _max_buffer_size: Optional[int]
+    _drain_waiter: Optional[asyncio.Future[None]]
 
-    def __init__(self, loop=None, on_cancel=None):
+    def __init__(self, loop=None, on_cancel=None, max_buffer_size: Optional[int] = None):
+        """`max_buffer_size` is the high-water mark used by `feed_data_async`; `feed_data` ignores it."""
         self._feed_task = None
         self._buffer = ""
         self._waiter = None
         self._eof = False
         self._loop = asyncio.get_event_loop() if loop is None else loop
         self._on_cancel = on_cancel
+        self._max_buffer_size = max_buffer_size
+        self._drain_waiter = None
 
     def feed_eof(self):
         if self._eof:
             return
         self._eof = True
         self._wakeup_waiter()
+        # release feeders blocked in feed_data_async: nothing will drain the buffer any more
+        waiter = self._drain_waiter
+        if waiter is not None:
+            self._drain_waiter = None
+            if not waiter.done():
+                waiter.set_result(None)
 
     def at_eof(self):
         return self._eof and not self._buffer
@@ -38,6 +49,25 @@ class TextStream:
         self._buffer += data
         self._wakeup_waiter()
 
+    def _is_full(self) -> bool:
+        return self._max_buffer_size is not None and len(self._buffer) >= self._max_buffer_size
+
+    async def feed_data_async(self, data: str):
+        """Like `feed_data`, but waits for the buffer to drain below `max_buffer_size` first."""
+        while self._is_full() and not self._eof:
+            if self._drain_waiter is None:
+                self._drain_waiter = self._loop.create_future()
+            # shielded because the waiter is shared by all blocked feeders
+            await asyncio.shield(self._drain_waiter)
+        self.feed_data(data)
+
+    def _wakeup_drain_waiter(self):
+        waiter = self._drain_waiter
+        if waiter is not None and not self._is_full():
+            self._drain_waiter = None
+            if not waiter.done():
+                waiter.set_result(None)
+
     def _wakeup_waiter(self):
         waiter = self._waiter
         if waiter is not None:
@@ -74,9 +104,7 @@ class TextStream:
         if n < 0:
             while not self._eof:
                 await self._wait_for_data("read()")
-            text = self._buffer
-            self._buffer = ""
-            return text
+            return self.pop_all()
         if not self._buffer and not self._eof:
             await self._wait_for_data(f"read({n})")
         return self.pop(n)
@@ -84,6 +112,7 @@ class TextStream:
     def pop_all(self):
         text = self._buffer
         self._buffer = ""
+        self._wakeup_drain_waiter()
         return text
 
     def pop(self, n: int):
@@ -96,6 +125,7 @@ class TextStream:
         """
         text = self._buffer[:n]
         self._buffer = self._buffer[n:]
+        self._wakeup_drain_waiter()
         return text
 
     async def readexactly(self, n: int):
@@ -171,8 +201,8 @@ class TextStream:
             await self._wait_for_data("readuntil()")
 
     def split_once(self, sep: str) -> tuple["TextStream", "TextStream"]:
-        before = TextStream(self._loop)
-        after = TextStream(self._loop)
+        before = TextStream(self._loop, max_buffer_size=self._max_buffer_size)
+        after = TextStream(self._loop, max_buffer_size=self._max_buffer_size)
 
         async def before_worker():
             while True:
@@ -188,9 +218,10 @@ class TextStream:
                     return
                 if len(self._buffer) > len(sep):
                     # if any(self._buffer.endswith(sep[:k]) for k in range(1, len(sep))):
-                    before.feed_data(self.pop(-len(sep)))
+                    await before.feed_data_async(self.pop(-len(sep)))
                     # else:
                     #     before.feed_data(self.pop_all())
+                    continue
                 await self._wait_for_data("split_once()")
 
         before_task = self._loop.create_task(before_worker())
@@ -206,7 +237,10 @@ class TextStream:
             if s != sep:
                 raise RuntimeError(f'expected separator "{sep}" but got "{s}"')
             while True:
-                after.feed_data(self.pop_all())
+                await after.feed_data_async(self.pop_all())
+                if self._buffer:
+                    # more data arrived while `after` was full
+                    continue
                 if self._eof:
                     after.feed_eof()
                     return
@@ -82,3 +82,44 @@ async def buffer(asg: AsyncIterable[A], maxsize=0) -> AsyncIterable[A]:
         yield x
     await t
     # note: t will automatically get cancelled when its reference count drops to zero
+
+
+async def coalesce(
+    asg: AsyncIterable[str], interval: float = 0.025, max_size: int = 512
+) -> AsyncIterable[str]:
+    """Merge the strings of `asg` into batches.
+
+    A batch is yielded once it holds at least `max_size` characters or `interval` seconds after
+    its first string arrived, whichever comes first. Anything still pending is yielded when
+    `asg` is exhausted.
+    """
+    loop = asyncio.get_running_loop()
+    xs = aiter(asg)
+    pending: list[str] = []
+    size = 0
+    deadline = 0.0
+    next_t = asyncio.ensure_future(anext(xs))
+    try:
+        while True:
+            timeout = max(0.0, deadline - loop.time()) if pending else None
+            done, _ = await asyncio.wait({next_t}, timeout=timeout)
+            if not done:
+                yield "".join(pending)
+                pending, size = [], 0
+                continue
+            try:
+                x = next_t.result()
+            except StopAsyncIteration:
+                break
+            if not pending:
+                deadline = loop.time() + interval
+            pending.append(x)
+            size += len(x)
+            if size >= max_size:
+                yield "".join(pending)
+                pending, size = [], 0
+            next_t = asyncio.ensure_future(anext(xs))
+        if pending:
+            yield "".join(pending)
+    finally:
+        next_t.cancel()